@@ -1,17 +1,57 @@
+import time
+STARTUP_TIME = time.perf_counter()
+
 import sys
 import os
 import re
-import requests
 import threading
-import time
 import json
-from bs4 import BeautifulSoup
+import csv
+import codecs
+import bisect
+import ipaddress
+import mmap
+import struct
+import errno
+import heapq
+import random
+import select
+import socket
+import socketserver
+from array import array
+from collections import deque
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                            QPushButton, QLabel, QTextEdit, QProgressBar, QFileDialog,
                            QMessageBox, QTabWidget, QComboBox, QCheckBox, QSpinBox, QGroupBox,
-                           QTableWidget, QTableWidgetItem, QHeaderView)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt5.QtGui import QFont, QIcon, QColor, QPalette
+                           QTableWidget, QTableWidgetItem, QHeaderView, QLineEdit)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QEvent
+from PyQt5.QtGui import QFont, QIcon, QColor, QPalette, QTextCursor
+
+# requests, urllib3, bs4 and brotli are imported on first use to keep startup fast
+IMPORT_TIME = time.perf_counter()
+
+def process_age():
+    # Seconds since the OS created this process, so interpreter startup is included; None if unavailable
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            creation, exit_time, kernel, user, now = (ctypes.c_ulonglong() for _ in range(5))
+            if not kernel32.GetProcessTimes(kernel32.GetCurrentProcess(), ctypes.byref(creation),
+                                            ctypes.byref(exit_time), ctypes.byref(kernel), ctypes.byref(user)):
+                return None
+            kernel32.GetSystemTimeAsFileTime(ctypes.byref(now))
+            return (now.value - creation.value) / 1e7
+        with open('/proc/self/stat') as f:
+            # Field 22 is the start time in clock ticks since boot; the command name may contain spaces
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
 
 class Proxy:
     def __init__(self, ip, port, country=None, city=None, anonymity=None, speed=0, uptime=0, last_checked=None, https=False, translator=None):
@@ -26,6 +66,9 @@ class Proxy:
         self.last_checked = last_checked if last_checked is not None else self._tr('unknown')
         self.https = https
         self.response_time = 0
+        self.checks = {}
+        self.asn = ''
+        self.source = ''
 
     def _tr(self, key):
         if self._translator:
@@ -35,6 +78,10 @@ class Proxy:
     @property
     def address(self):
         return f"{self.ip}:{self.port}"
+
+    @property
+    def passed_all_checks(self):
+        return bool(self.checks) and all(self.checks.values())
     
     def to_dict(self):
         return {
@@ -47,12 +94,15 @@ class Proxy:
             "uptime": self.uptime,
             "last_checked": self.last_checked,
             "https": self.https,
-            "response_time": self.response_time
+            "response_time": self.response_time,
+            "checks": self.checks,
+            "asn": self.asn,
+            "source": self.source
         }
 
     @classmethod 
     def from_dict(cls, data, translator=None):
-        return cls(
+        proxy = cls(
             ip=data.get("ip", ""),
             port=data.get("port", ""),
             country=data.get("country", None),
@@ -64,86 +114,1219 @@ class Proxy:
             https=data.get("https", False),
             translator=translator
         )
+        proxy.checks = data.get("checks", {})
+        proxy.asn = data.get("asn", '')
+        proxy.source = data.get("source", '')
+        return proxy
+
+class ProxyExporter:
+    FORMATS = ['txt', 'ndjson', 'csv']
+    CSV_FIELDS = ["ip", "port", "country", "city", "anonymity", "speed", "uptime", "last_checked", "https", "response_time", "asn"]
+
+    def __init__(self, file_path, fmt='txt', flush_every=50, flush_interval=2.0, buffer_size=64 * 1024, require_all_checks=False):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        self.file_path = file_path
+        self.fmt = fmt
+        self.temp_path = file_path + '.part'
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.require_all_checks = require_all_checks
+        self.count = 0
+        self.pending = 0
+        self.last_flush = time.time()
+        self.lock = threading.Lock()
+        self.file = open(self.temp_path, 'w', encoding='utf-8', newline='', buffering=buffer_size)
+        self.csv_writer = None
+        if fmt == 'csv':
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=self.CSV_FIELDS, extrasaction='ignore')
+            self.csv_writer.writeheader()
+
+    def write(self, proxy):
+        if self.require_all_checks and not proxy.passed_all_checks:
+            return
+        with self.lock:
+            if self.file.closed:
+                return
+            if self.fmt == 'txt':
+                self.file.write(f"{proxy.address}\n")
+            elif self.fmt == 'ndjson':
+                self.file.write(json.dumps(proxy.to_dict(), ensure_ascii=False) + "\n")
+            else:
+                self.csv_writer.writerow(proxy.to_dict())
+            self.count += 1
+            self.pending += 1
+            if self.pending >= self.flush_every or time.time() - self.last_flush >= self.flush_interval:
+                self._flush()
+
+    def _flush(self):
+        self.file.flush()
+        self.pending = 0
+        self.last_flush = time.time()
+
+    def close(self):
+        with self.lock:
+            if self.file.closed:
+                return
+            self._flush()
+            os.fsync(self.file.fileno())
+            self.file.close()
+            os.replace(self.temp_path, self.file_path)
+
+class SourceStats:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(os.path.expanduser("~"), ".nethyx", "source_stats.json")
+        self.stats = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.stats = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def success_rate(self, source):
+        # Smoothed towards a 10% prior so unseen sources are neither favoured nor buried
+        tested, working = self.stats.get(source, (0, 0))
+        return (working + 1) / (tested + 10)
+
+    def record(self, counts):
+        for source, (tested, working) in counts.items():
+            old_tested, old_working = self.stats.get(source, (0, 0))
+            self.stats[source] = (old_tested + tested, old_working + working)
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.stats, f)
+        except OSError as e:
+            print(f"Source stats save error: {e}")
+
+class ProxyScorer:
+    AGE_PATTERN = re.compile(r'(\d+)\s*(sec|min|hour|hr|day)', re.IGNORECASE)
+    AGE_UNITS = {'sec': 1, 'min': 60, 'hour': 3600, 'hr': 3600, 'day': 86400}
+
+    def __init__(self, source_stats):
+        self.source_stats = source_stats
+
+    def age(self, last_checked):
+        if isinstance(last_checked, (int, float)):
+            return max(0, time.time() - last_checked)
+        match = self.AGE_PATTERN.search(str(last_checked))
+        if match:
+            return int(match.group(1)) * self.AGE_UNITS[match.group(2).lower()]
+        try:
+            checked = datetime.fromisoformat(str(last_checked).replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        if checked.tzinfo is None:
+            checked = checked.replace(tzinfo=timezone.utc)
+        return max(0, (datetime.now(timezone.utc) - checked).total_seconds())
+
+    def score(self, proxy):
+        score = self.source_stats.success_rate(proxy.source)
+        if proxy.uptime:
+            score *= 0.5 + min(float(proxy.uptime), 100) / 100
+        age = self.age(proxy.last_checked)
+        if age is not None:
+            score *= 1.5 if age < 600 else 1.0 if age < 3600 else 0.7
+        if proxy.https:
+            score *= 1.2
+        try:
+            speed = float(proxy.speed)
+        except (TypeError, ValueError):
+            speed = 0
+        if speed > 0:
+            # Sources report speed as response time in ms: ~1.25x at 100 ms, ~1.05x at 1 s, ~0.9x at 5 s
+            score *= 0.8 + 0.5 / (1 + speed / 1000)
+        return score
+
+class HostLimiter:
+    def __init__(self, max_per_host=2, max_per_subnet=8):
+        self.max_per_host = max_per_host
+        self.max_per_subnet = max_per_subnet
+        self.hosts = {}
+        self.subnets = {}
+        self.is_running = True
+        self.condition = threading.Condition()
+
+    @staticmethod
+    def subnet(ip):
+        return ip.rsplit('.', 1)[0]
+
+    def acquire(self, ip):
+        subnet = self.subnet(ip)
+        with self.condition:
+            while self.is_running and (self.hosts.get(ip, 0) >= self.max_per_host or
+                                       self.subnets.get(subnet, 0) >= self.max_per_subnet):
+                self.condition.wait(0.5)
+            if not self.is_running:
+                return False
+            self.hosts[ip] = self.hosts.get(ip, 0) + 1
+            self.subnets[subnet] = self.subnets.get(subnet, 0) + 1
+            return True
+
+    def release(self, ip):
+        subnet = self.subnet(ip)
+        with self.condition:
+            for counts, key in ((self.hosts, ip), (self.subnets, subnet)):
+                counts[key] -= 1
+                if not counts[key]:
+                    del counts[key]
+            self.condition.notify_all()
+
+    def stop(self):
+        with self.condition:
+            self.is_running = False
+            self.condition.notify_all()
 
 class ProxyTester(QThread):
     update_signal = pyqtSignal(Proxy, int)
     finished_signal = pyqtSignal(list)
+    DEFAULT_TARGETS = ['https://www.google.com']
+    UNREACHABLE_ERRNOS = {getattr(errno, name) for name in
+                          ('EHOSTUNREACH', 'ENETUNREACH', 'EHOSTDOWN', 'WSAEHOSTUNREACH', 'WSAENETUNREACH', 'WSAEHOSTDOWN')
+                          if hasattr(errno, name)}
     
-    def __init__(self, proxies, timeout=5, max_workers=50):
+    def __init__(self, proxies, timeout=5, max_workers=50, exporter=None, targets=None, stop_after=0, time_budget=0,
+                 max_per_host=2, max_per_subnet=8):
         super().__init__()
         self.proxies = proxies
         self.timeout = timeout
         self.max_workers = max_workers
+        self.targets = targets or self.DEFAULT_TARGETS
+        self.exporter = exporter
+        self.stop_after = stop_after
+        self.time_budget = time_budget
+        self.deadline = None
         self.working_proxies = []
+        self.source_counts = {}
+        self.host_limiter = HostLimiter(max_per_host, max_per_subnet)
+        self.unreachable_hosts = set()
         self.is_running = True
         self.lock = threading.Lock()
         self.processed_count = 0
+
+    def budget_exhausted(self):
+        if self.stop_after and len(self.working_proxies) >= self.stop_after:
+            return True
+        return self.deadline is not None and time.time() >= self.deadline
         
     def run(self):
         total = len(self.proxies)
-        proxy_chunks = []
+        if self.time_budget:
+            self.deadline = time.time() + self.time_budget
+        if isinstance(self.proxies, list):
+            self.proxies = self.interleave_hosts(self.proxies)
         chunk_size = min(20, max(1, total // self.max_workers))
         
-        for i in range(0, total, chunk_size):
-            proxy_chunks.append(self.proxies[i:i + chunk_size])
-        
         threads = []
-        for chunk in proxy_chunks:
-            if not self.is_running:
-                break
-                
-            thread = threading.Thread(target=self.process_chunk, args=(chunk, total))
-            thread.daemon = True
-            threads.append(thread)
-            thread.start()
-            
-            active_threads = [t for t in threads if t.is_alive()]
-            while len(active_threads) >= self.max_workers:
-                time.sleep(0.1)
-                active_threads = [t for t in threads if t.is_alive()]
-        
-        for thread in threads:
-            if thread.is_alive():
-                thread.join()
+        try:
+            # Chunks are sliced lazily so imported key lists only build Proxy objects when tested
+            for i in range(0, total, chunk_size):
+                if not self.is_running or self.budget_exhausted():
+                    break
+                    
+                thread = threading.Thread(target=self.process_chunk, args=(self.proxies[i:i + chunk_size], total))
+                thread.daemon = True
+                threads.append(thread)
+                thread.start()
                 
-        self.finished_signal.emit(self.working_proxies)
+                threads = [t for t in threads if t.is_alive()]
+                while len(threads) >= self.max_workers:
+                    time.sleep(0.1)
+                    threads = [t for t in threads if t.is_alive()]
+        except Exception as e:
+            print(f"Testing error: {e}")
+        finally:
+            for thread in threads:
+                if thread.is_alive():
+                    thread.join()
+
+            if self.exporter:
+                try:
+                    self.exporter.close()
+                except Exception as e:
+                    print(f"Export finalize error: {e}")
+                    
+            self.finished_signal.emit(self.working_proxies)
     
+    @staticmethod
+    def interleave_hosts(proxies):
+        # Round-robin over hosts: every host's first port, then every second port...
+        rounds = []
+        seen = {}
+        for proxy in proxies:
+            n = seen.get(proxy.ip, 0)
+            seen[proxy.ip] = n + 1
+            if n == len(rounds):
+                rounds.append([])
+            rounds[n].append(proxy)
+        return [proxy for batch in rounds for proxy in batch]
+
+    @classmethod
+    def host_unreachable(cls, error):
+        pending = [error]
+        seen = set()
+        while pending:
+            e = pending.pop()
+            if not isinstance(e, BaseException) or id(e) in seen:
+                continue
+            seen.add(id(e))
+            if isinstance(e, OSError) and e.errno in cls.UNREACHABLE_ERRNOS:
+                return True
+            pending.extend([e.__cause__, e.__context__, getattr(e, 'reason', None)])
+            pending.extend(e.args)
+        return False
+
     def test_proxy(self, proxy):
+        return self.check(proxy, self.timeout, self.targets)
+
+    @staticmethod
+    def check(proxy, timeout, targets=None):
+        # All targets share one session so plain HTTP targets reuse the keep-alive
+        # connection to the proxy and HTTPS targets on the same host reuse the tunnel
+        targets = targets or ProxyTester.DEFAULT_TARGETS
+        checks = {}
+        response_time = 0
+        error = None
+        import requests
+        proxies = {
+            'http': f'http://{proxy.address}',
+            'https': f'http://{proxy.address}'
+        }
+        session = requests.Session()
+        # HTTP_PROXY/HTTPS_PROXY and NO_PROXY from the environment must never route around the proxy under test
+        session.trust_env = False
         try:
-            proxy_dict = {
-                'http': f'http://{proxy.address}',
-                'https': f'http://{proxy.address}'
-            }
-            
-            start_time = time.time()
-            response = requests.head('https://www.google.com', 
-                                  proxies=proxy_dict, 
-                                  timeout=self.timeout,
-                                  allow_redirects=True)
-            end_time = time.time()
-            response_time = int((end_time - start_time) * 1000)  # in milliseconds
-            
-            return response.status_code < 400, response_time
-        except:
-            return False, 0
+            for target in targets:
+                try:
+                    start_time = time.time()
+                    response = session.head(target, proxies=proxies, timeout=timeout, allow_redirects=True)
+                    end_time = time.time()
+                    passed = response.status_code < 400
+                except Exception as e:
+                    passed = False
+                    error = e
+                    end_time = time.time()
+                if target == targets[0] and passed:
+                    response_time = int((end_time - start_time) * 1000)  # in milliseconds
+                checks[target] = passed
+                if not passed:
+                    break
+        finally:
+            session.close()
+
+        return checks.get(targets[0], False), response_time, checks, error
     
     def process_chunk(self, proxies, total):
         for proxy in proxies:
-            if not self.is_running:
+            if not self.is_running or self.budget_exhausted():
                 break
                 
-            result, response_time = self.test_proxy(proxy)
+            skipped = proxy.ip in self.unreachable_hosts
+            if skipped:
+                result, response_time, checks = False, 0, {}
+            else:
+                if not self.host_limiter.acquire(proxy.ip):
+                    break
+                if not self.is_running or self.budget_exhausted():
+                    self.host_limiter.release(proxy.ip)
+                    break
+                try:
+                    result, response_time, checks, error = self.test_proxy(proxy)
+                finally:
+                    self.host_limiter.release(proxy.ip)
+                if not result and self.host_unreachable(error):
+                    self.unreachable_hosts.add(proxy.ip)
             
             with self.lock:
+                if self.stop_after and len(self.working_proxies) >= self.stop_after:
+                    break
                 self.processed_count += 1
                 progress = int(self.processed_count / total * 100)
+                proxy.checks = checks
+                # Skipped proxies were never tested, so they don't count against their source
+                if not skipped:
+                    counts = self.source_counts.setdefault(proxy.source, [0, 0])
+                    counts[0] += 1
                 
                 if result:
+                    counts[1] += 1
                     proxy.response_time = response_time
                     self.working_proxies.append (proxy)
+                    if self.exporter:
+                        self.exporter.write(proxy)
                     
                 self.update_signal.emit(proxy, progress)
             
+    def stop(self):
+        self.is_running = False
+        self.host_limiter.stop()
+
+class ProxyHealth:
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.checks = 0
+        self.successes = 0
+        self.consecutive_failures = 0
+        self.latency_mean = 0.0
+        self.latency_m2 = 0.0
+        self.last_checked = 0
+
+    def record(self, result, response_time):
+        self.checks += 1
+        self.last_checked = time.time()
+        if result:
+            self.successes += 1
+            self.consecutive_failures = 0
+            delta = response_time - self.latency_mean
+            self.latency_mean += delta / self.successes
+            self.latency_m2 += delta * (response_time - self.latency_mean)
+        else:
+            self.consecutive_failures += 1
+
+    @property
+    def success_rate(self):
+        # Laplace-smoothed so new proxies start out uncertain
+        return (self.successes + 1) / (self.checks + 2)
+
+    @property
+    def latency_cv(self):
+        if self.successes < 2 or self.latency_mean <= 0:
+            return 1.0
+        return (self.latency_m2 / (self.successes - 1)) ** 0.5 / self.latency_mean
+
+    def next_interval(self, min_interval, max_interval):
+        rate = self.success_rate
+        instability = max(4 * rate * (1 - rate), min(self.latency_cv, 1.0))
+        interval = max_interval - (max_interval - min_interval) * instability
+        if self.consecutive_failures > 1:
+            interval = min_interval * 2 ** self.consecutive_failures
+        return min(max(interval, min_interval), max_interval)
+
+class ProxyRevalidator(QThread):
+    update_signal = pyqtSignal(Proxy, bool)
+
+    def __init__(self, proxies, timeout=5, checks_per_second=5.0, max_workers=10,
+                 min_interval=30, max_interval=1800, max_failures=5, targets=None):
+        super().__init__()
+        self.timeout = timeout
+        self.targets = targets
+        self.checks_per_second = checks_per_second
+        self.max_workers = max_workers
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_failures = max_failures
+        self.health = {}
+        self.queue = []
+        self.counter = 0
+        self.next_slot = 0
+        self.is_running = True
+        self.condition = threading.Condition()
+        for proxy in proxies:
+            self.add(proxy)
+
+    def add(self, proxy, delay=0):
+        with self.condition:
+            if proxy.address in self.health:
+                # Keep the schedule but report results against the latest object for this address
+                self.health[proxy.address].proxy = proxy
+                return
+            self.health[proxy.address] = ProxyHealth(proxy)
+            self._schedule(proxy.address, time.time() + delay)
+
+    def _schedule(self, address, due):
+        self.counter += 1
+        heapq.heappush(self.queue, (due, self.counter, address))
+        self.condition.notify()
+
+    def _next_due(self):
+        with self.condition:
+            while self.is_running:
+                if self.queue:
+                    wait = self.queue[0][0] - time.time()
+                    if wait <= 0:
+                        return self.health.get(heapq.heappop(self.queue)[2])
+                    self.condition.wait(wait)
+                else:
+                    self.condition.wait()
+            return None
+
+    def _throttle(self):
+        with self.condition:
+            slot = max(time.time(), self.next_slot)
+            self.next_slot = slot + 1.0 / self.checks_per_second
+            # Wait on the condition so stop() can wake workers holding a future slot
+            while self.is_running:
+                wait = slot - time.time()
+                if wait <= 0:
+                    break
+                self.condition.wait(wait)
+
+    def worker(self):
+        while self.is_running:
+            health = self._next_due()
+            if health is None:
+                continue
+            self._throttle()
+            if not self.is_running:
+                break
+            result, response_time, checks, _ = ProxyTester.check(health.proxy, self.timeout, self.targets)
+            with self.condition:
+                health.record(result, response_time)
+                health.proxy.checks = checks
+                if result:
+                    health.proxy.response_time = response_time
+                if health.consecutive_failures >= self.max_failures:
+                    del self.health[health.proxy.address]
+                else:
+                    interval = health.next_interval(self.min_interval, self.max_interval)
+                    self._schedule(health.proxy.address, health.last_checked + interval)
+            self.update_signal.emit(health.proxy, result)
+
+    def run(self):
+        threads = []
+        for _ in range(self.max_workers):
+            thread = threading.Thread(target=self.worker)
+            thread.daemon = True
+            threads.append(thread)
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def stop(self):
+        with self.condition:
+            self.is_running = False
+            self.condition.notify_all()
+
+class ProxyPool:
+    # Alias table over a snapshot plus a small pending list for new entries. Removals are
+    # tombstoned and rejected when sampled, so updates are O(1) and rebuilds are amortized.
+    def __init__(self, max_pending=64):
+        self.lock = threading.Lock()
+        self.max_pending = max_pending
+        self.live = {}
+        self.version = 0
+        self.stale = 0
+        self.entries = []
+        self.prob = []
+        self.alias = []
+        self.table_weight = 0.0
+        self.pending = []
+        self.pending_weights = []
+
+    def __len__(self):
+        return len(self.live)
+
+    def add(self, proxy):
+        with self.lock:
+            self._discard(proxy.address)
+            self.version += 1
+            self.live[proxy.address] = (self.version, proxy)
+            total = self.pending_weights[-1] if self.pending_weights else 0.0
+            self.pending.append((proxy.address, self.version, proxy))
+            self.pending_weights.append(total + self.weight(proxy))
+            self._maintain()
+
+    def remove(self, proxy):
+        with self.lock:
+            self._discard(proxy.address)
+            self._maintain()
+
+    def clear(self):
+        with self.lock:
+            self.live.clear()
+            self._rebuild()
+
+    def _discard(self, address):
+        if self.live.pop(address, None) is not None:
+            self.stale += 1
+
+    def _maintain(self):
+        if len(self.pending) > self.max_pending or self.stale * 2 > len(self.entries) + len(self.pending):
+            self._rebuild()
+
+    @staticmethod
+    def weight(proxy):
+        return 1.0 / max(proxy.response_time, 1)
+
+    def _rebuild(self):
+        # Vose's alias method: O(n) build, O(1) sampling
+        self.entries = [(address, version, proxy) for address, (version, proxy) in self.live.items()]
+        self.pending = []
+        self.pending_weights = []
+        self.stale = 0
+        n = len(self.entries)
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+        weights = [self.weight(proxy) for _, _, proxy in self.entries]
+        self.table_weight = sum(weights)
+        if n == 0:
+            return
+        scaled = [w * n / self.table_weight for w in weights]
+        small = [i for i, w in enumerate(scaled) if w < 1.0]
+        large = [i for i, w in enumerate(scaled) if w >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+        for i in large + small:
+            self.prob[i] = 1.0
+
+    def sample(self):
+        with self.lock:
+            pending_weight = self.pending_weights[-1] if self.pending_weights else 0.0
+            while self.live:
+                r = random.random() * (self.table_weight + pending_weight)
+                if r < self.table_weight:
+                    i = random.randrange(len(self.entries))
+                    address, version, proxy = self.entries[i] if random.random() < self.prob[i] else self.entries[self.alias[i]]
+                else:
+                    j = min(bisect.bisect_right(self.pending_weights, r - self.table_weight), len(self.pending) - 1)
+                    address, version, proxy = self.pending[j]
+                live = self.live.get(address)
+                if live is not None and live[0] == version:
+                    return proxy
+            return None
+
+class GatewayHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        gateway = self.server.gateway
+        client = self.request
+        client.settimeout(gateway.timeout)
+        try:
+            head, rest = self.read_head(client)
+        except OSError:
+            return
+        parts = head.split(b'\r\n', 1)[0].decode('latin-1').split()
+        if len(parts) < 3:
+            return
+        method, target = parts[0].upper(), parts[1]
+
+        for _ in range(gateway.max_attempts):
+            proxy = gateway.pool.sample()
+            if proxy is None:
+                break
+            try:
+                upstream = socket.create_connection((proxy.ip, int(proxy.port)), timeout=gateway.timeout)
+            except (OSError, ValueError):
+                gateway.eject(proxy)
+                continue
+            extra = b''
+            try:
+                if method == 'CONNECT':
+                    upstream.sendall(f"CONNECT {target} HTTP/1.1\r\nHost: {target}\r\n\r\n".encode('latin-1'))
+                    reply, extra = self.read_head(upstream)
+                    status = reply.split(b' ', 2)[1:2]
+                    if not status or not status[0].startswith(b'2'):
+                        raise OSError("CONNECT rejected")
+                    if rest:
+                        upstream.sendall(rest)
+                else:
+                    upstream.sendall(head + rest)
+            except OSError:
+                upstream.close()
+                gateway.eject(proxy)
+                continue
+
+            try:
+                if method == 'CONNECT':
+                    client.sendall(b"HTTP/1.1 200 Connection established\r\n\r\n" + extra)
+            except OSError:
+                upstream.close()
+                return
+
+            received, forwarded, side, failed = self.pipe(client, upstream, gateway.idle_timeout)
+            upstream.close()
+            # An upstream that errors, or closes a plain request without answering, is broken
+            upstream_fault = side == 'upstream' and (failed or (method != 'CONNECT' and received == 0))
+            if upstream_fault:
+                gateway.eject(proxy)
+            # Only retry while the client has seen nothing from this attempt
+            if upstream_fault and method != 'CONNECT' and received == 0 and forwarded == 0:
+                continue
+            return
+
+        try:
+            client.sendall(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+        except OSError:
+            pass
+
+    @staticmethod
+    def read_head(sock, limit=64 * 1024):
+        data = b''
+        while b'\r\n\r\n' not in data:
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+            if len(data) > limit:
+                raise OSError("Header too large")
+        head, sep, rest = data.partition(b'\r\n\r\n')
+        return head + sep, rest
+
+    @staticmethod
+    def pipe(client, upstream, idle_timeout):
+        # Returns bytes relayed each way, which side ended the session and whether it failed
+        received = 0
+        forwarded = 0
+        sockets = [client, upstream]
+        while True:
+            readable, _, _ = select.select(sockets, [], [], idle_timeout)
+            if not readable:
+                return received, forwarded, None, False
+            for sock in readable:
+                source, sink = (upstream, client) if sock is upstream else (client, upstream)
+                side = 'upstream' if source is upstream else 'client'
+                try:
+                    data = source.recv(64 * 1024)
+                except OSError:
+                    return received, forwarded, side, True
+                if not data:
+                    return received, forwarded, side, False
+                try:
+                    sink.sendall(data)
+                except OSError:
+                    return received, forwarded, 'client' if sink is client else 'upstream', True
+                if source is upstream:
+                    received += len(data)
+                else:
+                    forwarded += len(data)
+
+class GatewayServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class ProxyGateway(QThread):
+    update_signal = pyqtSignal(str)
+    eject_signal = pyqtSignal(Proxy)
+
+    def __init__(self, pool, port=8899, host='127.0.0.1', timeout=10, idle_timeout=60, max_attempts=3):
+        super().__init__()
+        self.pool = pool
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_attempts = max_attempts
+        self.server = GatewayServer((host, port), GatewayHandler)
+        self.server.gateway = self
+
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return f"{host}:{port}"
+
+    def eject(self, proxy):
+        self.pool.remove(proxy)
+        self.eject_signal.emit(proxy)
+
+    def run(self):
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+
+    def stop(self):
+        self.server.shutdown()
+
+class DnsCache:
+    def __init__(self, ttl=300, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache = {}
+        self.lock = threading.Lock()
+
+    def resolve(self, host, port):
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+        key = (host, port)
+        now = time.time()
+        with self.lock:
+            entry = self.cache.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+        address = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)[0][4][0]
+        with self.lock:
+            self.cache.pop(key, None)
+            while len(self.cache) >= self.max_entries:
+                del self.cache[next(iter(self.cache))]
+            self.cache[key] = (now + self.ttl, address)
+        return address
+
+class SourceClient:
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+    def __init__(self, timeout=15, retries=3, max_per_host=8):
+        self.timeout = timeout
+        self.retries = retries
+        self.max_per_host = max_per_host
+        self.dns_cache = DnsCache()
+        self.session = None
+        self.lock = threading.Lock()
+
+    def build_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.connection import HTTPConnection, HTTPSConnection
+        from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+        from urllib3.util.retry import Retry
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+
+        class JitterRetry(Retry):
+            def get_backoff_time(self):
+                backoff = super().get_backoff_time()
+                return backoff + random.uniform(0, backoff) if backoff else 0
+
+        # The cached IP is swapped in only while the socket is opened; urllib3 derives
+        # Host, SNI and certificate checks from the same attribute afterwards
+        dns_cache = self.dns_cache
+
+        class CachedHTTPConnection(HTTPConnection):
+            def _new_conn(self):
+                host = self._dns_host
+                self._dns_host = dns_cache.resolve(host, self.port)
+                try:
+                    return super()._new_conn()
+                finally:
+                    self._dns_host = host
+
+        class CachedHTTPSConnection(HTTPSConnection):
+            def _new_conn(self):
+                host = self._dns_host
+                self._dns_host = dns_cache.resolve(host, self.port)
+                try:
+                    return super()._new_conn()
+                finally:
+                    self._dns_host = host
+
+        class CachedHTTPConnectionPool(HTTPConnectionPool):
+            ConnectionCls = CachedHTTPConnection
+
+        class CachedHTTPSConnectionPool(HTTPSConnectionPool):
+            ConnectionCls = CachedHTTPSConnection
+
+        class CachedDnsAdapter(HTTPAdapter):
+            def init_poolmanager(self, *args, **kwargs):
+                super().init_poolmanager(*args, **kwargs)
+                self.poolmanager.pool_classes_by_scheme = {
+                    'http': CachedHTTPConnectionPool,
+                    'https': CachedHTTPSConnectionPool
+                }
+
+        session = requests.Session()
+        session.headers['User-Agent'] = self.USER_AGENT
+        session.headers['Accept-Encoding'] = 'gzip, deflate, br' if brotli else 'gzip, deflate'
+        retry = JitterRetry(total=self.retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False)
+        adapter = CachedDnsAdapter(pool_connections=20, pool_maxsize=self.max_per_host, pool_block=True, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def request(self, method, url, **kwargs):
+        with self.lock:
+            if self.session is None:
+                self.session = self.build_session()
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+class GeoIPDatabase:
+    # Sorted IPv4 ranges as native uint32 arrays, followed by a record string table
+    MAGIC = b'NXGEO1\0\0'
+    HEADER = struct.Struct('=8sII')
+
+    def __init__(self, path):
+        self.path = path
+        self.cache = {}
+        self.file = open(path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, record_count = self.HEADER.unpack_from(self.mm, 0)
+        if magic != self.MAGIC:
+            self.close()
+            raise ValueError(f"Not a NethyX GeoIP database: {path}")
+        self.count = count
+        view = memoryview(self.mm)
+        offset = self.HEADER.size
+        self.starts = view[offset:offset + 4 * count].cast('I')
+        offset += 4 * count
+        self.ends = view[offset:offset + 4 * count].cast('I')
+        offset += 4 * count
+        self.record_ids = view[offset:offset + 4 * count].cast('I')
+        offset += 4 * count
+        self.record_offsets = view[offset:offset + 4 * (record_count + 1)].cast('I')
+        offset += 4 * (record_count + 1)
+        self.blob_offset = offset
+
+    def __len__(self):
+        return self.count
+
+    @staticmethod
+    def parse_ip(value):
+        value = value.strip()
+        if value.isdigit():
+            return int(value)
+        try:
+            return int(ipaddress.IPv4Address(value))
+        except ValueError:
+            return None
+
+    @classmethod
+    def build(cls, csv_path, out_path):
+        starts = array('I')
+        ends = array('I')
+        record_ids = array('I')
+        records = {}
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            for row in csv.reader(f):
+                if len(row) < 3:
+                    continue
+                start, end = cls.parse_ip(row[0]), cls.parse_ip(row[1])
+                if start is None or end is None or end > 0xFFFFFFFF:
+                    continue
+                record = tuple(row[i].strip().replace('\t', ' ') if len(row) > i else '' for i in (2, 3, 4))
+                starts.append(start)
+                ends.append(end)
+                record_ids.append(records.setdefault(record, len(records)))
+
+        # GeoIP exports are normally sorted already, so only reorder when needed
+        if any(starts[i] > starts[i + 1] for i in range(len(starts) - 1)):
+            order = sorted(range(len(starts)), key=starts.__getitem__)
+            starts = array('I', (starts[i] for i in order))
+            ends = array('I', (ends[i] for i in order))
+            record_ids = array('I', (record_ids[i] for i in order))
+
+        blob = bytearray()
+        offsets = array('I', [0])
+        for record in records:
+            blob += '\t'.join(record).encode('utf-8')
+            offsets.append(len(blob))
+
+        # Written aside and renamed so a database that is still mapped is never truncated underneath it
+        temp_path = out_path + '.part'
+        with open(temp_path, 'wb') as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, len(starts), len(records)))
+            for column in (starts, ends, record_ids):
+                f.write(column.tobytes())
+            f.write(offsets.tobytes())
+            f.write(blob)
+        os.replace(temp_path, out_path)
+        return cls(out_path)
+
+    def record(self, index):
+        record = self.cache.get(index)
+        if record is None:
+            start = self.blob_offset + self.record_offsets[index]
+            end = self.blob_offset + self.record_offsets[index + 1]
+            record = tuple(self.mm[start:end].decode('utf-8').split('\t'))
+            self.cache[index] = record
+        return record
+
+    def lookup(self, ip):
+        try:
+            value = int.from_bytes(socket.inet_aton(ip), 'big')
+        except (OSError, TypeError):
+            return None
+        i = bisect.bisect_right(self.starts, value) - 1
+        if i < 0 or value > self.ends[i]:
+            return None
+        return self.record(self.record_ids[i])
+
+    def enrich(self, proxies):
+        enriched = 0
+        for proxy in proxies:
+            record = self.lookup(proxy.ip)
+            if record is None:
+                continue
+            country, city, asn = record
+            if country:
+                proxy.country = country
+            if city:
+                proxy.city = city
+            if asn:
+                proxy.asn = asn
+            enriched += 1
+        return enriched
+
+    def close(self):
+        for name in ('starts', 'ends', 'record_ids', 'record_offsets'):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        self.mm.close()
+        self.file.close()
+
+class GeoIPBuilder(QThread):
+    finished_signal = pyqtSignal(object, str)
+
+    def __init__(self, csv_path, out_path):
+        super().__init__()
+        self.csv_path = csv_path
+        self.out_path = out_path
+
+    def run(self):
+        try:
+            self.finished_signal.emit(GeoIPDatabase.build(self.csv_path, self.out_path), '')
+        except Exception as e:
+            self.finished_signal.emit(None, str(e))
+
+class ProxyKeyList:
+    # Proxies packed as (ipv4 << 16 | port) keys; Proxy objects are built on access
+    def __init__(self, keys, metadata=None, translator=None, geoip=None):
+        self.keys = keys
+        self.metadata = metadata or {}
+        self.translator = translator
+        self.geoip = geoip
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.build(key) for key in self.keys[index]]
+        return self.build(self.keys[index])
+
+    def __iter__(self):
+        for key in self.keys:
+            yield self.build(key)
+
+    def build(self, key):
+        ip = socket.inet_ntoa((key >> 16).to_bytes(4, 'big'))
+        proxy = Proxy(ip=ip, port=str(key & 0xFFFF), translator=self.translator)
+        record = self.metadata.get(key)
+        if record:
+            for field, value in zip(ProxyImporter.METADATA_FIELDS, record):
+                if value is not None:
+                    setattr(proxy, field, value)
+        if self.geoip:
+            self.geoip.enrich([proxy])
+        return proxy
+
+class ProxyImporter(QThread):
+    update_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(object)
+    TXT_PATTERN = re.compile(rb'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})[:, \t]+(\d{1,5})(?!\d)')
+    # A whole line of plain "ip:port": octets 0-255 without leading zeros and ports 1-65535
+    OCTET = rb'(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)'
+    PORT = rb'(?:6553[0-5]|655[0-2]\d|65[0-4]\d\d|6[0-4]\d{3}|[1-5]\d{4}|[1-9]\d{0,3})'
+    LINE_PATTERN = re.compile(rb'^[ \t]*(' + rb'\.'.join([OCTET] * 4) + rb'):(' + PORT + rb')[ \t\r]*$', re.M)
+    CHUNK_SIZE = 1024 * 1024
+    PROGRESS_EVERY = 500000
+    HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+    BYTES_PER_LINE = 20
+    # Only these fields survive a JSON import; checks and response_time are per-test results
+    METADATA_FIELDS = ('country', 'city', 'anonymity', 'speed', 'uptime', 'last_checked', 'https', 'asn', 'source')
+    METADATA_DEFAULTS = (None, '', 0, 'Unknown', 'unknown')
+
+    def __init__(self, file_path, translator, geoip=None):
+        super().__init__()
+        self.file_path = file_path
+        self.translator = translator
+        self.geoip = geoip
+        self.keys = array('Q')
+        self.table = None
+        self.table_bits = 0
+        self.metadata = {}
+        self.interned = {}
+        self.parsed = 0
+        self.is_running = True
+
+    @staticmethod
+    def make_key(ip, port):
+        octets = ip.split(b'.') if isinstance(ip, bytes) else str(ip).strip().split('.')
+        if len(octets) != 4:
+            return None
+        value = 0
+        for octet in octets:
+            octet = int(octet)
+            if not 0 <= octet <= 255:
+                return None
+            value = value << 8 | octet
+        port = int(port)
+        if not 0 < port < 65536:
+            return None
+        return value << 16 | port
+
+    def resize(self, capacity):
+        # Open-addressing set of key + 1 (0 marks an empty slot), kept below 0.7 load
+        bits = 10
+        while (1 << bits) * 7 < capacity * 10:
+            bits += 1
+        if bits <= self.table_bits:
+            return
+        table = array('Q', bytes(8 << bits))
+        mask = (1 << bits) - 1
+        shift = 64 - bits
+        multiplier = self.HASH_MULTIPLIER
+        for key in self.keys:
+            slot = ((key + 1) * multiplier & 0xFFFFFFFFFFFFFFFF) >> shift
+            while table[slot]:
+                slot = (slot + 1) & mask
+            table[slot] = key + 1
+        self.table = table
+        self.table_bits = bits
+
+    def insert(self, keys):
+        # Appends the keys not seen before, in order, and returns how many were new
+        before = len(self.keys)
+        append = self.keys.append
+        multiplier = self.HASH_MULTIPLIER
+        limit = 0
+        for key in keys:
+            if limit <= len(self.keys):
+                self.resize(len(self.keys) + 1)
+                table = self.table
+                mask = (1 << self.table_bits) - 1
+                shift = 64 - self.table_bits
+                limit = len(table) * 7 // 10
+            stored = key + 1
+            slot = (stored * multiplier & 0xFFFFFFFFFFFFFFFF) >> shift
+            current = table[slot]
+            while current and current != stored:
+                slot = (slot + 1) & mask
+                current = table[slot]
+            if not current:
+                table[slot] = stored
+                append(key)
+        return len(self.keys) - before
+
+    def progress(self, count):
+        previous = self.parsed
+        self.parsed += count
+        if self.parsed // self.PROGRESS_EVERY != previous // self.PROGRESS_EVERY:
+            self.update_signal.emit(self.translator('import_progress').format(parsed=self.parsed, unique=len(self.keys)))
+
+    def compact(self, data):
+        # Keeps non-default fields only, as a shared tuple of interned values
+        record = []
+        for field in self.METADATA_FIELDS:
+            value = data.get(field)
+            if not isinstance(value, (str, int, float)) or value in self.METADATA_DEFAULTS:
+                value = None
+            else:
+                value = self.interned.setdefault((type(value), value), value)
+            record.append(value)
+        if not any(value is not None for value in record):
+            return None
+        record = tuple(record)
+        return self.interned.setdefault(record, record)
+
+    def parse_txt(self, mm):
+        aton = socket.inet_aton
+        make_key = self.make_key
+        search = self.TXT_PATTERN.search
+        offset = 0
+        while offset < len(mm) and self.is_running:
+            end = mm.find(b'\n', min(offset + self.CHUNK_SIZE, len(mm)))
+            end = len(mm) if end == -1 else end + 1
+            chunk = mm[offset:end]
+            lines = chunk.splitlines()
+            matches = self.LINE_PATTERN.findall(chunk)
+            offset = end
+            if len(matches) == len(lines):
+                # Every line is a clean ip:port, so skip the per-line checks and fallbacks
+                self.insert(array('Q', [int.from_bytes(aton(ip.decode('ascii')), 'big') << 16 | int(port)
+                                        for ip, port in matches]))
+                self.progress(len(lines))
+                continue
+            batch = array('Q')
+            count = 0
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+                count += 1
+                ip, _, port = line.rpartition(b':')
+                try:
+                    # inet_aton reads leading zeros as octal, so only plain dotted quads take the fast path
+                    if ip.count(b'.') == 3 and ip[:1] != b'0' and b'.0' not in ip:
+                        port = int(port)
+                        key = int.from_bytes(aton(ip.decode('ascii')), 'big') << 16 | port if 0 < port < 65536 else None
+                    else:
+                        key = make_key(ip, port)
+                except (ValueError, OSError):
+                    key = None
+                if key is None:
+                    match = search(line)
+                    key = make_key(*match.groups()) if match else None
+                    if key is None:
+                        continue
+                batch.append(key)
+            self.insert(batch)
+            self.progress(count)
+
+    def parse_json(self, mm):
+        # Streams both save_proxies JSON arrays and NDJSON without decoding the whole file
+        decoder = json.JSONDecoder()
+        utf8 = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        buffer = ''
+        idx = 0
+        offset = 0
+        eof = False
+        while self.is_running:
+            while idx < len(buffer) and buffer[idx] in ' \t\r\n,[]':
+                idx += 1
+            if idx >= len(buffer) or not eof and len(buffer) - idx < self.CHUNK_SIZE:
+                if eof and idx >= len(buffer):
+                    break
+                if not eof:
+                    chunk = mm[offset:offset + self.CHUNK_SIZE]
+                    offset += len(chunk)
+                    eof = offset >= len(mm)
+                    buffer = buffer[idx:] + utf8.decode(chunk, final=eof)
+                    idx = 0
+                    continue
+            try:
+                obj, idx = decoder.raw_decode(buffer, idx)
+            except ValueError:
+                newline = buffer.find('\n', idx)
+                if newline == -1:
+                    break
+                idx = newline + 1
+                continue
+            if isinstance(obj, dict):
+                try:
+                    key = self.make_key(obj.get('ip', ''), obj.get('port', 0))
+                except (TypeError, ValueError, OverflowError):
+                    key = None
+                if key is not None and self.insert((key,)):
+                    record = self.compact(obj)
+                    if record:
+                        self.metadata[key] = record
+                self.progress(1)
+
+    def run(self):
+        try:
+            size = os.path.getsize(self.file_path)
+            self.resize(size // self.BYTES_PER_LINE)
+            if size > 0:
+                with open(self.file_path, 'rb') as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        first = mm[:4096].lstrip()[:1]
+                        if first in (b'[', b'{'):
+                            self.parse_json(mm)
+                        else:
+                            self.parse_txt(mm)
+        except Exception as e:
+            self.update_signal.emit(self.translator('import_error').format(error=str(e)))
+        self.table = None
+        self.interned = None
+        proxies = ProxyKeyList(self.keys, self.metadata, self.translator, self.geoip)
+        self.update_signal.emit(self.translator('import_done').format(parsed=self.parsed, unique=len(proxies)))
+        self.finished_signal.emit(proxies)
+
     def stop(self):
         self.is_running = False
 
@@ -151,10 +1334,11 @@ class ProxyScraper(QThread):
     update_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(list)
     
-    def __init__(self, sources, translator):
+    def __init__(self, sources, translator, geoip=None):
         super().__init__()
         self.sources = sources
         self.translator = translator
+        self.geoip = geoip
         self.proxies = []
         self.is_running = True
         
@@ -166,20 +1350,25 @@ class ProxyScraper(QThread):
                 break
                 
             self.update_signal.emit(self.translator('scraping_from').format(source=source['name']))
+            new_proxies = []
             try:
-                new_proxies_raw = source['function']()
-                new_proxies = []
-                for p_data in new_proxies_raw:
+                # Sources may be generators that yield proxies page by page
+                for p_data in source['function']():
+                    if not self.is_running:
+                        break
                     if isinstance(p_data, Proxy):
                         p_data._translator = self.translator
-                        new_proxies.append(p_data)
                     elif isinstance(p_data, dict):
-                         new_proxies.append(Proxy.from_dict(p_data, translator=self.translator))
+                        p_data = Proxy.from_dict(p_data, translator=self.translator)
+                    else:
+                        continue
+                    p_data.source = source['name']
+                    new_proxies.append(p_data)
 
-                self.proxies.extend(new_proxies)
                 self.update_signal.emit(self.translator('found_proxies_from').format(count=len(new_proxies), source=source['name']))
             except Exception as e:
                 self.update_signal.emit(self.translator('error_scraping').format(source=source['name'], error=str(e)))
+            self.proxies.extend(new_proxies)
         
         unique_proxies = {}
         for proxy in self.proxies:
@@ -191,12 +1380,59 @@ class ProxyScraper(QThread):
              if not hasattr(proxy, '_translator') or proxy._translator is None:
                  proxy._translator = self.translator
 
+        if self.geoip:
+            enriched = self.geoip.enrich(self.proxies)
+            self.update_signal.emit(self.translator('geoip_enriched').format(count=enriched))
+
         self.update_signal.emit(self.translator('total_unique_found').format(count=len(self.proxies)))
         self.finished_signal.emit(self.proxies)
     
     def stop(self):
         self.is_running = False
 
+class LogView:
+    def __init__(self, widget, max_lines=5000, flush_interval=200):
+        self.widget = widget
+        self.pending = deque(maxlen=max_lines)
+        self.widget.document().setMaximumBlockCount(max_lines)
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(flush_interval)
+        self.timer.timeout.connect(self.flush)
+
+    def set_max_lines(self, max_lines):
+        self.pending = deque(self.pending, maxlen=max_lines)
+        self.widget.document().setMaximumBlockCount(max_lines)
+
+    def hidden(self):
+        return self.widget.isHidden()
+
+    def append(self, message):
+        if self.hidden():
+            return
+        self.pending.append(message)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        if not self.pending:
+            return
+        text = "\n".join(self.pending)
+        self.pending.clear()
+        document = self.widget.document()
+        scrollbar = self.widget.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text if document.isEmpty() else "\n" + text)
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def clear(self):
+        self.timer.stop()
+        self.pending.clear()
+        self.widget.clear()
+
 class ProxyScraperApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -217,7 +1453,7 @@ class ProxyScraperApp(QMainWindow):
                 'test_btn': "Test Proxies",
                 'stop_test_btn': "Stop",
                 'progress': "Progress",
-                'results_columns': ["IP:Port", "Status", "Country", "City", "Anonymity", "Speed (ms)", "Uptime (%)", "Last Checked", "HTTPS"],
+                'results_columns': ["IP:Port", "Status", "Country", "City", "Anonymity", "Speed (ms)", "Uptime (%)", "Last Checked", "HTTPS", "ASN"],
                 'save_btn': "Save Working Proxies",
                 'status_label': "Ready",
                 'company': "WebAdHere Software",
@@ -247,7 +1483,44 @@ class ProxyScraperApp(QMainWindow):
                 'no_working_proxies_warning': "No working proxies found to save.",
                 'save_success': "Proxies saved successfully: {count}",
                 'save_error': "Error saving file: {error}",
-                'saving_title': "Save Format"
+                'saving_title': "Save Format",
+                'auto_export': "Auto-export working proxies",
+                'auto_export_format': "Format:",
+                'auto_export_started': "Exporting working proxies to {path}",
+                'auto_export_done': "{count} working proxies exported to {path}",
+                'gateway': "Local gateway on port",
+                'gateway_started': "Gateway listening on {address} ({count} proxies)",
+                'gateway_stopped': "Gateway stopped",
+                'gateway_ejected': "Gateway ejected {address} ({count} proxies left)",
+                'gateway_error': "Could not start gateway: {error}",
+                'revalidate': "Continuous revalidation",
+                'revalidate_rate': "Checks per second:",
+                'revalidate_started': "Revalidating {count} proxies in the background",
+                'revalidate_stopped': "Revalidation stopped",
+                'revalidate_update': "{count} working proxies (last checked: {address})",
+                'page_budget': "API page budget:",
+                'check_targets': "Check targets:",
+                'check_targets_tooltip': "Comma-separated URLs checked in order over one connection per proxy; the first one decides whether a proxy is working",
+                'require_all_checks': "Export only proxies passing all targets",
+                'checks_passed': "{passed}/{total} targets",
+                'geoip_btn': "Load GeoIP Database",
+                'geoip_loaded': "GeoIP database loaded: {count} ranges ({path})",
+                'geoip_error': "Could not load GeoIP database: {error}",
+                'geoip_building': "Building GeoIP database from {path}...",
+                'geoip_enriched': "GeoIP: {count} proxies enriched",
+                'log_line_limit': "Log line limit:",
+                'import_btn': "Import Proxies",
+                'import_started': "Importing proxies from {path}...",
+                'import_progress': "{parsed} entries read, {unique} unique",
+                'import_done': "Import finished: {parsed} entries read, {unique} unique proxies",
+                'import_error': "Import error: {error}",
+                'test_likely_first': "Test likeliest proxies first",
+                'stop_after': "Stop after working:",
+                'time_budget': "Time budget (seconds):",
+                'no_limit': "No limit",
+                'max_per_host': "Max per host:",
+                'max_per_subnet': "Max per /24:",
+                'startup_report': "Startup: interpreter {interpreter} ms, imports {imports} ms, window ready {window} ms, first paint {paint} ms"
             }
         }
         self.current_language = 'en'
@@ -266,8 +1539,20 @@ class ProxyScraperApp(QMainWindow):
         self.proxies = []
         self.working_proxies = []
         self.scraper_thread = None
+        self.importer_thread = None
         self.tester_thread = None
+        self.exporter = None
+        self.proxy_pool = ProxyPool()
+        self.gateway_thread = None
+        self.revalidator_thread = None
+        self.page_budget = 10
+        self.source_stats = SourceStats()
+        self.geoip = None
+        self.geoip_builder = None
+        self.log_line_limit = 5000
+        self.http = SourceClient()
         self.setup_ui()
+        self.ready_time = time.perf_counter()
 
     def translate(self, key):
         return self.languages['en'].get(key, key)
@@ -292,6 +1577,14 @@ class ProxyScraperApp(QMainWindow):
             checkbox.setChecked(True)
             self.source_checkboxes.append((checkbox, source))
             sources_layout.addWidget(checkbox)
+        page_budget_layout = QHBoxLayout()
+        page_budget_layout.addWidget(QLabel(self.translate('page_budget')))
+        self.page_budget_spinbox = QSpinBox()
+        self.page_budget_spinbox.setRange(1, 200)
+        self.page_budget_spinbox.setValue(self.page_budget)
+        page_budget_layout.addWidget(self.page_budget_spinbox)
+        page_budget_layout.addStretch()
+        sources_layout.addLayout(page_budget_layout)
         self.scraper_layout.addWidget(self.sources_group)
         scraper_buttons_layout = QHBoxLayout()
         self.scrape_button = QPushButton(self.translate('scrape_btn'))
@@ -301,10 +1594,27 @@ class ProxyScraperApp(QMainWindow):
         self.stop_scrape_button.clicked.connect(self.stop_scraping)
         self.stop_scrape_button.setEnabled(False)
         scraper_buttons_layout.addWidget(self.stop_scrape_button)
+        self.geoip_button = QPushButton(self.translate('geoip_btn'))
+        self.geoip_button.clicked.connect(self.load_geoip)
+        scraper_buttons_layout.addWidget(self.geoip_button)
+        self.import_button = QPushButton(self.translate('import_btn'))
+        self.import_button.clicked.connect(self.import_proxies)
+        scraper_buttons_layout.addWidget(self.import_button)
         self.scraper_layout.addLayout(scraper_buttons_layout)
         self.log_text = QTextEdit()
         self.log_text.setReadOnly(True)
         self.scraper_layout.addWidget(self.log_text)
+        self.scraper_log = LogView(self.log_text, self.log_line_limit)
+        log_limit_layout = QHBoxLayout()
+        log_limit_layout.addWidget(QLabel(self.translate('log_line_limit')))
+        self.log_limit_spinbox = QSpinBox()
+        self.log_limit_spinbox.setRange(100, 100000)
+        self.log_limit_spinbox.setSingleStep(1000)
+        self.log_limit_spinbox.setValue(self.log_line_limit)
+        self.log_limit_spinbox.valueChanged.connect(self.set_log_line_limit)
+        log_limit_layout.addWidget(self.log_limit_spinbox)
+        log_limit_layout.addStretch()
+        self.scraper_layout.addLayout(log_limit_layout)
         self.tester_tab = QWidget()
         self.tester_layout = QVBoxLayout(self.tester_tab)
         self.test_settings_group = QGroupBox(self.translate('test_settings'))
@@ -324,7 +1634,68 @@ class ProxyScraperApp(QMainWindow):
         self.threads_spinbox.setSingleStep(10)
         threads_layout.addWidget(self.threads_spinbox)
         test_settings_layout.addLayout(threads_layout)
+        targets_layout = QHBoxLayout()
+        targets_layout.addWidget(QLabel(self.translate('check_targets')))
+        self.targets_edit = QLineEdit(", ".join(ProxyTester.DEFAULT_TARGETS))
+        self.targets_edit.setToolTip(self.translate('check_targets_tooltip'))
+        targets_layout.addWidget(self.targets_edit)
+        test_settings_layout.addLayout(targets_layout)
         self.tester_layout.addWidget(self.test_settings_group)
+        early_stop_layout = QHBoxLayout()
+        self.ordered_checkbox = QCheckBox(self.translate('test_likely_first'))
+        self.ordered_checkbox.setChecked(True)
+        early_stop_layout.addWidget(self.ordered_checkbox)
+        early_stop_layout.addWidget(QLabel(self.translate('stop_after')))
+        self.stop_after_spinbox = QSpinBox()
+        self.stop_after_spinbox.setRange(0, 100000)
+        self.stop_after_spinbox.setSpecialValueText(self.translate('no_limit'))
+        early_stop_layout.addWidget(self.stop_after_spinbox)
+        early_stop_layout.addWidget(QLabel(self.translate('time_budget')))
+        self.time_budget_spinbox = QSpinBox()
+        self.time_budget_spinbox.setRange(0, 86400)
+        self.time_budget_spinbox.setSpecialValueText(self.translate('no_limit'))
+        early_stop_layout.addWidget(self.time_budget_spinbox)
+        early_stop_layout.addWidget(QLabel(self.translate('max_per_host')))
+        self.max_per_host_spinbox = QSpinBox()
+        self.max_per_host_spinbox.setRange(1, 50)
+        self.max_per_host_spinbox.setValue(2)
+        early_stop_layout.addWidget(self.max_per_host_spinbox)
+        early_stop_layout.addWidget(QLabel(self.translate('max_per_subnet')))
+        self.max_per_subnet_spinbox = QSpinBox()
+        self.max_per_subnet_spinbox.setRange(1, 200)
+        self.max_per_subnet_spinbox.setValue(8)
+        early_stop_layout.addWidget(self.max_per_subnet_spinbox)
+        early_stop_layout.addStretch()
+        self.tester_layout.addLayout(early_stop_layout)
+        export_layout = QHBoxLayout()
+        self.auto_export_checkbox = QCheckBox(self.translate('auto_export'))
+        export_layout.addWidget(self.auto_export_checkbox)
+        export_layout.addWidget(QLabel(self.translate('auto_export_format')))
+        self.auto_export_format = QComboBox()
+        self.auto_export_format.addItems([fmt.upper() for fmt in ProxyExporter.FORMATS])
+        export_layout.addWidget(self.auto_export_format)
+        self.require_all_checkbox = QCheckBox(self.translate('require_all_checks'))
+        export_layout.addWidget(self.require_all_checkbox)
+        export_layout.addStretch()
+        self.gateway_checkbox = QCheckBox(self.translate('gateway'))
+        self.gateway_checkbox.toggled.connect(self.toggle_gateway)
+        export_layout.addWidget(self.gateway_checkbox)
+        self.gateway_port_spinbox = QSpinBox()
+        self.gateway_port_spinbox.setRange(1024, 65535)
+        self.gateway_port_spinbox.setValue(8899)
+        export_layout.addWidget(self.gateway_port_spinbox)
+        self.tester_layout.addLayout(export_layout)
+        revalidate_layout = QHBoxLayout()
+        self.revalidate_checkbox = QCheckBox(self.translate('revalidate'))
+        self.revalidate_checkbox.toggled.connect(self.toggle_revalidation)
+        revalidate_layout.addWidget(self.revalidate_checkbox)
+        revalidate_layout.addWidget(QLabel(self.translate('revalidate_rate')))
+        self.revalidate_rate_spinbox = QSpinBox()
+        self.revalidate_rate_spinbox.setRange(1, 100)
+        self.revalidate_rate_spinbox.setValue(5)
+        revalidate_layout.addWidget(self.revalidate_rate_spinbox)
+        revalidate_layout.addStretch()
+        self.tester_layout.addLayout(revalidate_layout)
         test_buttons_layout = QHBoxLayout()
         self.test_button = QPushButton(self.translate('test_btn'))
         self.test_button.clicked.connect(self.start_testing)
@@ -340,7 +1711,7 @@ class ProxyScraperApp(QMainWindow):
         self.progress_bar.setValue(0)
         self.tester_layout.addWidget(self.progress_bar)
         self.results_table = QTableWidget()
-        self.results_table.setColumnCount(9)
+        self.results_table.setColumnCount(10)
         self.results_table.setHorizontalHeaderLabels(self.translate('results_columns'))
         self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.results_table.setAlternatingRowColors(True)
@@ -348,6 +1719,7 @@ class ProxyScraperApp(QMainWindow):
         self.results_text = QTextEdit()
         self.results_text.setReadOnly(True)
         self.results_text.setVisible(False)
+        self.results_log = LogView(self.results_text, self.log_line_limit)
         save_buttons_layout = QHBoxLayout()
         self.save_button = QPushButton(self.translate('save_btn'))
         self.save_button.clicked.connect(self.save_proxies)
@@ -410,10 +1782,14 @@ class ProxyScraperApp(QMainWindow):
             }
         ]
     
+    def parse_html(self, text):
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(text, 'html.parser')
+
     def scrape_free_proxy_list(self):
         proxies = []
-        response = requests.get('https://free-proxy-list.net/')
-        soup = BeautifulSoup(response.text, 'html.parser')
+        response = self.http.get('https://free-proxy-list.net/')
+        soup = self.parse_html(response.text)
         table = soup.find('table')
         
         if table:
@@ -441,11 +1817,57 @@ class ProxyScraperApp(QMainWindow):
         
         return proxies
     
+    def paginate(self, fetch_page, max_pages, concurrency=4, requests_per_second=5.0):
+        seen = set()
+        lock = threading.Lock()
+        next_slot = [0.0]
+
+        def throttled_fetch(page):
+            with lock:
+                now = time.time()
+                slot = max(now, next_slot[0])
+                next_slot[0] = slot + 1.0 / requests_per_second
+            if slot > now:
+                time.sleep(slot - now)
+            return fetch_page(page)
+
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        pending = {}
+        try:
+            next_page = 1
+            while next_page <= min(concurrency, max_pages):
+                pending[next_page] = executor.submit(throttled_fetch, next_page)
+                next_page += 1
+
+            page = 1
+            while page in pending:
+                new_proxies = []
+                for proxy in pending.pop(page).result():
+                    if proxy.address not in seen:
+                        seen.add(proxy.address)
+                        new_proxies.append(proxy)
+                if not new_proxies or (self.scraper_thread and not self.scraper_thread.is_running):
+                    break
+                yield from new_proxies
+
+                if next_page <= max_pages:
+                    pending[next_page] = executor.submit(throttled_fetch, next_page)
+                    next_page += 1
+                page += 1
+        finally:
+            for future in pending.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+
     def scrape_geonode(self):
+        def fetch_page(page):
+            response = self.http.get(f'https://proxylist.geonode.com/api/proxy-list?limit=300&page={page}&sort_by=lastChecked&sort_type=desc')
+            return self.parse_geonode(response.json())
+
+        return self.paginate(fetch_page, self.page_budget, concurrency=4, requests_per_second=5.0)
+
+    def parse_geonode(self, data):
         proxies = []
-        response = requests.get('https://proxylist.geonode.com/api/proxy-list?limit=300&page=1&sort_by=lastChecked&sort_type=desc')
-        data = response.json()
-        
         for proxy_data in data.get('data', []):
             ip = proxy_data.get('ip')
             port = proxy_data.get('port')
@@ -476,7 +1898,7 @@ class ProxyScraperApp(QMainWindow):
     
     def scrape_proxyscrape(self):
         proxies = []
-        response = requests.get('https://api.proxyscrape.com/v2/?request=getproxies&protocol=http&timeout=10000&country=all&ssl=all&anonymity=all')
+        response = self.http.get('https://api.proxyscrape.com/v2/?request=getproxies&protocol=http&timeout=10000&country=all&ssl=all&anonymity=all')
         
         if response.status_code == 200:
             proxy_list = response.text.strip().split('\r\n')
@@ -490,7 +1912,7 @@ class ProxyScraperApp(QMainWindow):
     
     def scrape_proxy_list_download(self):
         proxies = []
-        response = requests.get('https://www.proxy-list.download/api/v1/get?type=http')
+        response = self.http.get('https://www.proxy-list.download/api/v1/get?type=http')
         
         if response.status_code == 200:
             proxy_list = response.text.strip().split('\r\n')
@@ -505,11 +1927,8 @@ class ProxyScraperApp(QMainWindow):
     def scrape_hidemy_name(self):
         proxies = []
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get('https://hidemy.name/en/proxy-list/', headers=headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response = self.http.get('https://hidemy.name/en/proxy-list/')
+            soup = self.parse_html(response.text)
             table = soup.find('table', {'class': 'table_block'})
             
             if table:
@@ -550,11 +1969,8 @@ class ProxyScraperApp(QMainWindow):
     def scrape_spys_one(self):
         proxies = []
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get('https://spys.one/en/free-proxy-list/', headers=headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response = self.http.get('https://spys.one/en/free-proxy-list/')
+            soup = self.parse_html(response.text)
             
             proxy_table = soup.find('table', {'class': 'spy1x'})
             if proxy_table:
@@ -601,11 +2017,8 @@ class ProxyScraperApp(QMainWindow):
     def scrape_proxynova(self):
         proxies = []
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get('https://www.proxynova.com/proxy-server-list/', headers=headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response = self.http.get('https://www.proxynova.com/proxy-server-list/')
+            soup = self.parse_html(response.text)
             
             table = soup.select_one('table#tbl_proxy_list')
             if table:
@@ -667,9 +2080,14 @@ class ProxyScraperApp(QMainWindow):
         return proxies
     
     def scrape_pubproxy(self):
+        # PubProxy has no page parameter; each request returns a random batch,
+        # so pagination stops once a batch brings nothing new
+        return self.paginate(self.fetch_pubproxy_page, self.page_budget, concurrency=1, requests_per_second=1.0)
+
+    def fetch_pubproxy_page(self, page):
         proxies = []
         try:
-            response = requests.get('http://pubproxy.com/api/proxy?limit=5&format=json&https=true')
+            response = self.http.get('http://pubproxy.com/api/proxy?limit=5&format=json&https=true')
             data = response.json()
             
             for proxy_data in data.get('data', []):
@@ -700,11 +2118,8 @@ class ProxyScraperApp(QMainWindow):
     def scrape_openproxy_space(self):
         proxies = []
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get('https://openproxy.space/list/http', headers=headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response = self.http.get('https://openproxy.space/list/http')
+            soup = self.parse_html(response.text)
             
             proxy_divs = soup.select('div.table-responsive div.proxy')
             for div in proxy_divs:
@@ -721,8 +2136,8 @@ class ProxyScraperApp(QMainWindow):
     def scrape_sslproxies(self):
         proxies = []
         try:
-            response = requests.get('https://www.sslproxies.org/')
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response = self.http.get('https://www.sslproxies.org/')
+            soup = self.parse_html(response.text)
             
             table = soup.find('table', {'id': 'proxylisttable'})
             if table:
@@ -764,56 +2179,148 @@ class ProxyScraperApp(QMainWindow):
             return
         
         self.scrape_button.setEnabled(False)
+        self.import_button.setEnabled(False)
         self.stop_scrape_button.setEnabled(True)
         self.test_button.setEnabled(False)
-        self.log_text.clear()
+        self.scraper_log.clear()
         self.status_label.setText(self.translate('scraping_from').format(source=''))
         
-        self.scraper_thread = ProxyScraper(selected_sources, self.translate)
+        self.page_budget = self.page_budget_spinbox.value()
+        self.scraper_thread = ProxyScraper(selected_sources, self.translate, geoip=self.geoip)
         self.scraper_thread.update_signal.connect(self.update_scraper_log)
         self.scraper_thread.finished_signal.connect(self.scraping_finished)
         self.scraper_thread.start()
     
+    def load_geoip(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Load GeoIP Database", "",
+                                                   "GeoIP Files (*.nxgeo *.csv)")
+        if not file_path:
+            return
+        if file_path.lower().endswith('.csv'):
+            self.geoip_button.setEnabled(False)
+            self.status_label.setText(self.translate('geoip_building').format(path=file_path))
+            self.geoip_builder = GeoIPBuilder(file_path, os.path.splitext(file_path)[0] + '.nxgeo')
+            self.geoip_builder.finished_signal.connect(self.geoip_loaded)
+            self.geoip_builder.start()
+            return
+        try:
+            geoip = GeoIPDatabase(file_path)
+        except Exception as e:
+            self.geoip_loaded(None, str(e))
+            return
+        self.geoip_loaded(geoip, '')
+
+    def geoip_loaded(self, geoip, error):
+        self.geoip_button.setEnabled(True)
+        if geoip is None:
+            QMessageBox.critical(self, self.translate('error'), self.translate('geoip_error').format(error=error))
+            return
+        # The previous database stays open for key lists and scrapers that still hold it
+        self.geoip = geoip
+        self.status_label.setText(self.translate('geoip_loaded').format(count=len(geoip), path=geoip.path))
+
+    def import_proxies(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Import Proxies", "",
+                                                   "Proxy Lists (*.txt *.json *.ndjson *.jsonl);;All Files (*)")
+        if not file_path:
+            return
+        self.scrape_button.setEnabled(False)
+        self.import_button.setEnabled(False)
+        self.stop_scrape_button.setEnabled(True)
+        self.test_button.setEnabled(False)
+        self.scraper_log.clear()
+        self.status_label.setText(self.translate('import_started').format(path=file_path))
+
+        self.importer_thread = ProxyImporter(file_path, self.translate, geoip=self.geoip)
+        self.importer_thread.update_signal.connect(self.update_scraper_log)
+        self.importer_thread.finished_signal.connect(self.import_finished)
+        self.importer_thread.start()
+
+    def import_finished(self, proxies):
+        self.proxies = proxies
+        self.scrape_button.setEnabled(True)
+        self.import_button.setEnabled(True)
+        self.stop_scrape_button.setEnabled(False)
+        self.test_button.setEnabled(len(self.proxies) > 0)
+        self.status_label.setText(self.translate('total_unique_found').format(count=len(self.proxies)))
+
     def stop_scraping(self):
+        # Stop also cancels an import; its finished handler keeps whatever was parsed so far
+        if self.importer_thread and self.importer_thread.isRunning():
+            self.importer_thread.stop()
+            self.stop_scrape_button.setEnabled(False)
+            return
         if self.scraper_thread and self.scraper_thread.isRunning():
             self.scraper_thread.stop()
             self.status_label.setText(self.translate('scraping_stopped'))
             self.scrape_button.setEnabled(True)
+            self.import_button.setEnabled(True)
             self.stop_scrape_button.setEnabled(False)
     
     def update_scraper_log(self, message):
-        self.log_text.append(message)
-        self.log_text.verticalScrollBar().setValue(self.log_text.verticalScrollBar().maximum())
+        self.scraper_log.append(message)
+
+    def set_log_line_limit(self, value):
+        self.log_line_limit = value
+        self.scraper_log.set_max_lines(value)
+        self.results_log.set_max_lines(value)
     
     def scraping_finished(self, proxies):
         self.proxies = proxies
         self.scrape_button.setEnabled(True)
+        self.import_button.setEnabled(True)
         self.stop_scrape_button.setEnabled(False)
         self.test_button.setEnabled(len(self.proxies) > 0)
         self.status_label.setText(self.translate('total_unique_found').format(count=len(self.proxies)))
         
-        self.log_text.append(f"\n{self.translate('total_unique_found').format(count=len(self.proxies))}")
+        self.scraper_log.append(f"\n{self.translate('total_unique_found').format(count=len(self.proxies))}")
     
     def start_testing(self):
         if not self.proxies:
             QMessageBox.warning(self, self.translate('warning'), self.translate('no_proxies_to_test_warning'))
             return
         
+        self.exporter = None
+        if self.auto_export_checkbox.isChecked():
+            fmt = ProxyExporter.FORMATS[self.auto_export_format.currentIndex()]
+            file_path, _ = QFileDialog.getSaveFileName(self, "Export Proxies",
+                                                     os.path.expanduser(f"~/Desktop/working_proxies.{fmt}"),
+                                                     f"{fmt.upper()} Files (*.{fmt})")
+            if not file_path:
+                return
+            try:
+                self.exporter = ProxyExporter(file_path, fmt, require_all_checks=self.require_all_checkbox.isChecked())
+            except Exception as e:
+                QMessageBox.critical(self, self.translate('error'), self.translate('save_error').format(error=str(e)))
+                return
+        
         self.test_button.setEnabled(False)
         self.stop_test_button.setEnabled(True)
         self.save_button.setEnabled(False)
-        self.results_text.clear()
+        self.results_log.clear()
         self.progress_bar.setValue(0)
         self.status_label.setText(self.translate('testing_proxies'))
+        if self.exporter:
+            self.status_label.setText(self.translate('auto_export_started').format(path=self.exporter.file_path))
         
         timeout = self.timeout_spinbox.value()
         max_workers = self.threads_spinbox.value()
         
-        self.tester_thread = ProxyTester(self.proxies, timeout, max_workers)
+        proxies = self.proxies
+        if self.ordered_checkbox.isChecked() and isinstance(proxies, list):
+            proxies = sorted(proxies, key=ProxyScorer(self.source_stats).score, reverse=True)
+        
+        self.tester_thread = ProxyTester(proxies, timeout, max_workers, exporter=self.exporter, targets=self.check_targets(),
+                                         stop_after=self.stop_after_spinbox.value(), time_budget=self.time_budget_spinbox.value(),
+                                         max_per_host=self.max_per_host_spinbox.value(), max_per_subnet=self.max_per_subnet_spinbox.value())
         self.tester_thread.update_signal.connect(self.update_test_results)
         self.tester_thread.finished_signal.connect(self.testing_finished)
         self.tester_thread.start()
     
+    def check_targets(self):
+        targets = [target.strip() for target in self.targets_edit.text().split(',') if target.strip()]
+        return targets or ProxyTester.DEFAULT_TARGETS
+
     def stop_testing(self):
         if self.tester_thread and self.tester_thread.isRunning():
             self.tester_thread.stop()
@@ -822,12 +2329,13 @@ class ProxyScraperApp(QMainWindow):
             self.stop_test_button.setEnabled(False)
     
     def update_test_results(self, proxy, progress):
-        if hasattr(proxy, 'response_time') and proxy.response_time > 0:
-            message = self.translate('proxy_working').format(address=proxy.address, time=proxy.response_time)
-        else:
-            message = self.translate('proxy_not_working').format(address=proxy.address)
-            
-        self.results_text.append(message)
+        # The results log is hidden by default, so skip building a line per proxy nobody sees
+        if not self.results_log.hidden():
+            if hasattr(proxy, 'response_time') and proxy.response_time > 0:
+                message = self.translate('proxy_working').format(address=proxy.address, time=proxy.response_time)
+            else:
+                message = self.translate('proxy_not_working').format(address=proxy.address)
+            self.results_log.append(message)
         self.progress_bar.setValue(progress)
         
         row_position = self.results_table.rowCount()
@@ -836,7 +2344,17 @@ class ProxyScraperApp(QMainWindow):
         self.results_table.setItem(row_position, 0, QTableWidgetItem(proxy.address))
         
         is_working = hasattr(proxy, 'response_time') and proxy.response_time > 0
+        if is_working:
+            self.proxy_pool.add(proxy)
+            if self.revalidator_thread:
+                self.revalidator_thread.add(proxy, self.revalidator_thread.min_interval)
+        else:
+            self.proxy_pool.remove(proxy)
         status = self.translate('status_working') if is_working else self.translate('status_not_working')
+        targets = self.tester_thread.targets if self.tester_thread else ProxyTester.DEFAULT_TARGETS
+        if len(targets) > 1:
+            passed = sum(1 for value in proxy.checks.values() if value)
+            status += f" ({self.translate('checks_passed').format(passed=passed, total=len(targets))})"
         status_item = QTableWidgetItem(status)
         status_item.setForeground(QColor("green" if is_working else "red"))
         self.results_table.setItem(row_position, 1, status_item)
@@ -853,17 +2371,22 @@ class ProxyScraperApp(QMainWindow):
         
         https_text = self.translate('yes') if proxy.https else self.translate('no')
         self.results_table.setItem(row_position, 8, QTableWidgetItem(https_text))
+        self.results_table.setItem(row_position, 9, QTableWidgetItem(proxy.asn or "-"))
         
         self.results_table.scrollToBottom()
     
     def testing_finished(self, working_proxies):
         self.working_proxies = working_proxies
+        self.source_stats.record(self.tester_thread.source_counts)
+        self.source_stats.save()
         self.test_button.setEnabled(True)
         self.stop_test_button.setEnabled(False)
         self.save_button.setEnabled(len(self.working_proxies) > 0)
         
-        self.results_text.append(f"\n{self.translate('test_complete_found').format(count=len(self.working_proxies))}")
+        self.results_log.append(f"\n{self.translate('test_complete_found').format(count=len(self.working_proxies))}")
         self.status_label.setText(self.translate('save_working_proxies_found').format(count=len(self.working_proxies)))
+        if self.exporter:
+            self.status_label.setText(self.translate('auto_export_done').format(count=self.exporter.count, path=self.exporter.file_path))
         
         for row in range(self.results_table.rowCount()):
             ip_port = self.results_table.item(row, 0).text()
@@ -874,8 +2397,102 @@ class ProxyScraperApp(QMainWindow):
                         if item:
                             item.setBackground(QColor(230, 255, 230))
     
+    def toggle_gateway(self, enabled):
+        if enabled:
+            for proxy in self.working_proxies:
+                self.proxy_pool.add(proxy)
+            try:
+                self.gateway_thread = ProxyGateway(self.proxy_pool, self.gateway_port_spinbox.value())
+            except Exception as e:
+                QMessageBox.critical(self, self.translate('error'), self.translate('gateway_error').format(error=str(e)))
+                self.gateway_checkbox.setChecked(False)
+                return
+            self.gateway_thread.eject_signal.connect(self.gateway_ejected)
+            self.gateway_thread.start()
+            self.gateway_port_spinbox.setEnabled(False)
+            self.status_label.setText(self.translate('gateway_started').format(address=self.gateway_thread.address, count=len(self.proxy_pool)))
+        elif self.gateway_thread:
+            self.gateway_thread.stop()
+            self.gateway_thread.wait()
+            self.gateway_thread = None
+            self.gateway_port_spinbox.setEnabled(True)
+            self.status_label.setText(self.translate('gateway_stopped'))
+
+    def gateway_ejected(self, proxy):
+        self.status_label.setText(self.translate('gateway_ejected').format(address=proxy.address, count=len(self.proxy_pool)))
+
+    def toggle_revalidation(self, enabled):
+        if enabled:
+            self.revalidator_thread = ProxyRevalidator(self.working_proxies,
+                                                       timeout=self.timeout_spinbox.value(),
+                                                       checks_per_second=self.revalidate_rate_spinbox.value(),
+                                                       targets=self.check_targets())
+            self.revalidator_thread.update_signal.connect(self.revalidation_result)
+            self.revalidator_thread.start()
+            self.revalidate_rate_spinbox.setEnabled(False)
+            self.status_label.setText(self.translate('revalidate_started').format(count=len(self.working_proxies)))
+        elif self.revalidator_thread:
+            self.revalidator_thread.stop()
+            self.revalidator_thread.wait()
+            self.revalidator_thread = None
+            self.revalidate_rate_spinbox.setEnabled(True)
+            self.status_label.setText(self.translate('revalidate_stopped'))
+
+    def revalidation_result(self, proxy, result):
+        # Match by address, a later scrape holds a different object for the same proxy
+        index = next((i for i, p in enumerate(self.working_proxies) if p.address == proxy.address), None)
+        if result:
+            if index is None:
+                self.working_proxies.append(proxy)
+            else:
+                self.working_proxies[index] = proxy
+            self.proxy_pool.add(proxy)
+        else:
+            if index is not None:
+                del self.working_proxies[index]
+            self.proxy_pool.remove(proxy)
+        self.save_button.setEnabled(len(self.working_proxies) > 0)
+        self.status_label.setText(self.translate('revalidate_update').format(count=len(self.working_proxies), address=proxy.address))
+
+    def eventFilter(self, obj, event):
+        # Installed on the application only for --startup-report; the first paint of any widget in
+        # this window starts a synchronous repaint, so a zero timer queued here runs once it is done
+        if event.type() == QEvent.Paint and obj.isWidgetType() and obj.window() is self:
+            QApplication.instance().removeEventFilter(self)
+            QTimer.singleShot(0, self.report_startup)
+        return super().eventFilter(obj, event)
+
+    def report_startup(self):
+        paint_time = time.perf_counter()
+        age = process_age()
+        # Falls back to the first line of this module when the process creation time is unknown
+        origin = paint_time - age if age is not None and age >= paint_time - STARTUP_TIME else STARTUP_TIME
+        report = self.translate('startup_report').format(
+            interpreter=int((STARTUP_TIME - origin) * 1000),
+            imports=int((IMPORT_TIME - origin) * 1000),
+            window=int((self.ready_time - origin) * 1000),
+            paint=int((paint_time - origin) * 1000))
+        print(report)
+        self.scraper_log.append(report)
+        self.status_label.setText(report)
+
+    def closeEvent(self, event):
+        if self.importer_thread:
+            self.importer_thread.stop()
+            self.importer_thread.wait()
+        if self.gateway_thread:
+            self.gateway_thread.stop()
+            self.gateway_thread.wait()
+        if self.revalidator_thread:
+            self.revalidator_thread.stop()
+            self.revalidator_thread.wait()
+        super().closeEvent(event)
+
     def save_proxies(self):
-        if not self.working_proxies:
+        proxies = self.working_proxies
+        if self.require_all_checkbox.isChecked():
+            proxies = [proxy for proxy in proxies if proxy.passed_all_checks]
+        if not proxies:
             QMessageBox.warning(self, self.translate('warning'), self.translate('no_working_proxies_warning'))
             return
         
@@ -899,10 +2516,10 @@ class ProxyScraperApp(QMainWindow):
             if file_path:
                 try:
                     with open(file_path, 'w') as f:
-                        for proxy in self.working_proxies:
+                        for proxy in proxies:
                             f.write(f"{proxy.address}\n")
                     
-                    QMessageBox.information(self, self.translate('success'), self.translate('save_success').format(count=len(self.working_proxies)))
+                    QMessageBox.information(self, self.translate('success'), self.translate('save_success').format(count=len(proxies)))
                 except Exception as e:
                     QMessageBox.critical(self, self.translate('error'), self.translate('save_error').format(error=str(e)))
         
@@ -913,16 +2530,18 @@ class ProxyScraperApp(QMainWindow):
             
             if file_path:
                 try:
-                    proxy_data = [proxy.to_dict() for proxy in self.working_proxies]
+                    proxy_data = [proxy.to_dict() for proxy in proxies]
                     with open(file_path, 'w', encoding='utf-8') as f:
                         json.dump(proxy_data, f, indent=4, ensure_ascii=False)
                     
-                    QMessageBox.information(self, self.translate('success'), self.translate('save_success').format(count=len(self.working_proxies)))
+                    QMessageBox.information(self, self.translate('success'), self.translate('save_success').format(count=len(proxies)))
                 except Exception as e:
                     QMessageBox.critical(self, self.translate('error'), self.translate('save_error').format(error=str(e)))
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = ProxyScraperApp()
+    if '--startup-report' in sys.argv:
+        app.installEventFilter(window)
     window.show()
     sys.exit(app.exec_())
\ No newline at end of file
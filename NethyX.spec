@@ -1,9 +1,14 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
 
 block_cipher = None
 
+# Set NETHYX_ONEDIR=1 for the startup-optimized build: an unpacked onedir
+# bundle without UPX, so nothing has to be extracted or decompressed on launch.
+onedir = os.environ.get('NETHYX_ONEDIR') == '1'
+
 a = Analysis(
-    ['proxy_scraper.py'],
+    ['NethyX.py'],
     pathex=[],
     binaries=[],
     datas=[('prxy.ico', '.')], 
@@ -11,7 +16,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['tkinter', 'unittest', 'pydoc', 'doctest', 'pdb'],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -19,25 +24,55 @@ a = Analysis(
 )
 plist = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
 
-exe = EXE(
-    plist,
-    a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
-    [],
-    name='proxy_scraper',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=False,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-    icon='prxy.ico', 
-)
\ No newline at end of file
+if onedir:
+    exe = EXE(
+        plist,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='NethyX',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+        icon='prxy.ico', 
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.zipfiles,
+        a.datas,
+        strip=False,
+        upx=False,
+        upx_exclude=[],
+        name='NethyX',
+    )
+else:
+    exe = EXE(
+        plist,
+        a.scripts,
+        a.binaries,
+        a.zipfiles,
+        a.datas,
+        [],
+        name='NethyX',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=True,
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+        icon='prxy.ico', 
+    )